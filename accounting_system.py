@@ -1,81 +1,75 @@
-import pandas as pd
-import numpy as np
-from report_generator import ReportGenerator
+from ledger import Ledger, ChartOfAccounts
+from period_index import PeriodIndex
+from comparative_reports import ComparativeReportGenerator
 
 class AccountingSystem:
     """
     مسؤول عن تجميع البيانات المصنفة وتوليد التقارير المحاسبية الرئيسية.
+    جميع القوائم تُحسب من دفتر الأستاذ (القيد المزدوج) عبر فهرس الفترات.
     """
-    def __init__(self, df):
+    def __init__(self, df, chart=None):
         self.df = df
-        self.report_generator = ReportGenerator(df)
+        self.chart = chart or ChartOfAccounts()
+        self.ledger = None
         self.journal_entries = None
+        self.period_index = None
+
+    def get_ledger(self):
+        """
+        دفتر الأستاذ: القيود والترحيلات (يُبنى مرة واحدة).
+        """
+        if self.ledger is None:
+            self.ledger = Ledger(self.df, self.chart)
+        return self.ledger
 
     def create_journal_entries(self):
         """
-        توليد قيود اليومية من حركات كشف الحساب.
-        """
-        if self.journal_entries is not None:
-            return self.journal_entries
-            
-        journal_entries = []
-        
-        # 1. تحديد الحسابات المدينة والدائنة لكل حركة
-        for index, row in self.df.iterrows():
-            account = row['الحساب المحاسبي']
-            amount_debit = row['مدين']
-            amount_credit = row['دائن']
-            details = row['التفاصيل']
-            date = row['[SA]Processing Date']
-            
-            # الحركة المدينة (مصروفات، سحوبات، أصول)
-            if amount_debit > 0:
-                # القيد: [الحساب المصنف] مدين / [البنك] دائن
-                journal_entries.append({
-                    'التاريخ': date,
-                    'الحساب المدين': account,
-                    'الحساب الدائن': 'البنك',
-                    'المبلغ المدين': amount_debit,
-                    'المبلغ الدائن': amount_debit,
-                    'الوصف': details
-                })
-            
-            # الحركة الدائنة (إيرادات، إيداعات، خصوم)
-            elif amount_credit > 0:
-                # القيد: [البنك] مدين / [الحساب المصنف] دائن
-                journal_entries.append({
-                    'التاريخ': date,
-                    'الحساب المدين': 'البنك',
-                    'الحساب الدائن': account,
-                    'المبلغ المدين': amount_credit,
-                    'المبلغ الدائن': amount_credit,
-                    'الوصف': details
-                })
-                
-        self.journal_entries = pd.DataFrame(journal_entries)
+        توليد قيود اليومية من حركات كشف الحساب (سطر لكل طرف من أطراف القيد).
+        """
+        if self.journal_entries is None:
+            self.journal_entries = self.get_ledger().journal()
         return self.journal_entries
 
-    def generate_trial_balance(self):
+    def get_period_index(self):
+        """
+        فهرس المجاميع التراكمية اليومية لتقارير الفترات (يُبنى مرة واحدة).
+        """
+        if self.period_index is None:
+            self.period_index = PeriodIndex(self.get_ledger())
+        return self.period_index
+
+    def generate_account_ledger(self, account, start=None, end=None):
+        """
+        توليد دفتر الأستاذ لحساب واحد مع الرصيد الجاري.
+        """
+        return self.get_ledger().account_ledger(account, start, end)
+
+    def generate_trial_balance(self, start=None, end=None):
+        """
+        توليد ميزان المراجعة (لكامل الملف أو لفترة محددة).
+        """
+        return self.get_period_index().generate_trial_balance(start, end)
+
+    def generate_income_statement(self, start=None, end=None):
         """
-        توليد ميزان المراجعة.
+        توليد قائمة الدخل (لكامل الملف أو لفترة محددة).
         """
-        journal_entries = self.create_journal_entries()
-        return self.report_generator.generate_trial_balance(journal_entries)
+        return self.get_period_index().generate_income_statement(start, end)
 
-    def generate_income_statement(self):
+    def generate_cash_flow_statement(self, start=None, end=None):
         """
-        توليد قائمة الدخل.
+        توليد قائمة التدفقات النقدية (لكامل الملف أو لفترة محددة).
         """
-        return self.report_generator.generate_income_statement()
+        return self.get_period_index().generate_cash_flow_statement(start, end)
 
-    def generate_cash_flow_statement(self):
+    def generate_balance_sheet(self, start=None, end=None):
         """
-        توليد قائمة التدفقات النقدية.
+        توليد الميزانية العمومية (لكامل الملف أو حتى نهاية فترة محددة).
         """
-        return self.report_generator.generate_cash_flow_statement()
+        return self.get_period_index().generate_balance_sheet(start, end)
 
-    def generate_balance_sheet(self):
+    def generate_comparative_report(self):
         """
-        توليد الميزانية العمومية.
+        توليد التقرير المقارن متعدد الفترات (شهر بشهر وسنة بسنة).
         """
-        return self.report_generator.generate_balance_sheet()
+        return ComparativeReportGenerator(self.get_period_index()).generate_comparative_report()
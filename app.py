@@ -1,10 +1,12 @@
+import os
+import uuid
 import streamlit as st
-from accounting_system import AccountingSystem
-from data_loader import DataLoader
-from data_cleaner import DataCleaner
-from transaction_classifier import TransactionClassifier
-from report_generator import ReportGenerator
 from ui_utils import display_report_metrics, display_dataframe, display_summary_metrics
+from pipeline_cache import PipelineCache, PipelineResult
+
+# وحدات المعالجة والتقارير (pandas/numpy) تُستورد عند رفع الملف فقط،
+# لأن Streamlit يعيد تشغيل السكربت مع كل تفاعل ويجب أن تظهر شاشة الرفع سريعاً.
+# لقياس زمن البدء: python startup_benchmark.py
 
 # إعداد صفحة Streamlit
 st.set_page_config(page_title="المحاسب الذكي المحترف", page_icon="🏦", layout="wide")
@@ -12,42 +14,101 @@ st.set_page_config(page_title="المحاسب الذكي المحترف", page_i
 st.title("🏦 النظام المحاسبي المتكامل المحترف")
 st.markdown("---")
 
+@st.cache_resource
+def get_pipeline_cache():
+    """مخزن مشترك بين جميع الجلسات لنتائج معالجة الملفات."""
+    max_mb = int(os.environ.get('PIPELINE_CACHE_MAX_MB', '512'))
+    return PipelineCache(max_bytes=max_mb * 1024 ** 2, spill_dir=os.environ.get('PIPELINE_CACHE_DIR'))
+
+def build_pipeline(uploaded_file):
+    """تحميل وتنظيف وتصنيف الملف وتجهيز النظام المحاسبي (مرة واحدة لكل محتوى)."""
+    from accounting_system import AccountingSystem
+    from data_loader import DataLoader
+    from data_cleaner import DataCleaner
+    from transaction_classifier import TransactionClassifier
+    
+    data_loader = DataLoader(uploaded_file)
+    df = data_loader.load_data()
+    
+    if df is None:
+        return None
+
+    data_cleaner = DataCleaner(df)
+    df = data_cleaner.clean_data()
+    
+    classifier = TransactionClassifier(df)
+    df = classifier.classify_transactions()
+    
+    accounting_system = AccountingSystem(df)
+    # بناء قيود اليومية مسبقاً حتى تبقى النتيجة المشتركة للقراءة فقط
+    accounting_system.create_journal_entries()
+    accounting_system.get_period_index()
+    return PipelineResult(df, accounting_system)
+
+def select_period(period_index):
+    """اختيار فترة التقرير من الشريط الجانبي، وإرجاع (البداية، النهاية) أو (None, None) لكامل الملف."""
+    first_date, last_date = period_index.first_date, period_index.last_date
+    if first_date is None:
+        return None, None
+    
+    st.sidebar.title("📅 فترة التقرير")
+    period = st.sidebar.radio("الفترة", ["كامل الملف", "من بداية الربع", "من بداية السنة", "فترة مخصصة"])
+    
+    # الفترات النسبية تُحسب حتى آخر تاريخ في الملف
+    if period == "من بداية الربع":
+        return max(first_date, last_date.to_period('Q').start_time), last_date
+    if period == "من بداية السنة":
+        return max(first_date, last_date.to_period('Y').start_time), last_date
+    if period == "فترة مخصصة":
+        selected = st.sidebar.date_input("من - إلى", value=(first_date.date(), last_date.date()),
+                                         min_value=first_date.date(), max_value=last_date.date())
+        if isinstance(selected, (list, tuple)) and len(selected) == 2:
+            return selected[0], selected[1]
+        # اختيار تاريخ واحد فقط أثناء التحديد
+        start = selected[0] if isinstance(selected, (list, tuple)) else selected
+        return start, start
+    return None, None
+
 def main():
     """الواجهة الرئيسية لتطبيق Streamlit"""
     st.sidebar.title("📁 رفع الملف")
     uploaded_file = st.sidebar.file_uploader("اختر ملف كشف الحساب البنكي (Excel)", type=['xlsx', 'xls'])
     
+    pipeline_cache = get_pipeline_cache()
+    if 'session_id' not in st.session_state:
+        st.session_state['session_id'] = uuid.uuid4().hex
+    pipeline_cache.touch_session(st.session_state['session_id'])
+    
     if uploaded_file is not None:
         try:
-            # 1. تحميل وتنظيف البيانات
+            from report_generator import ReportGenerator
+            
+            # 1. تحميل وتنظيف وتصنيف البيانات (أو استرجاعها من المخزن المشترك)
             st.info("جاري تحميل ومعالجة البيانات...")
-            data_loader = DataLoader(uploaded_file)
-            df = data_loader.load_data()
+            content_key = PipelineCache.content_hash(uploaded_file.getvalue())
+            result = pipeline_cache.get_or_build(content_key, lambda: build_pipeline(uploaded_file))
             
-            if df is None:
+            if result is None:
                 st.error("فشل تحميل البيانات. يرجى التأكد من صيغة الملف.")
                 return
 
-            data_cleaner = DataCleaner(df)
-            df = data_cleaner.clean_data()
-            
-            # 2. تصنيف الحركات
-            classifier = TransactionClassifier(df)
-            df = classifier.classify_transactions()
-            
-            # 3. إنشاء النظام المحاسبي
-            accounting_system = AccountingSystem(df)
+            # 2. نسخة الجلسة من البيانات (بدون نسخ) والنظام المحاسبي المشترك
+            df = result.session_view()
+            accounting_system = result.accounting_system
+            start, end = select_period(accounting_system.get_period_index())
             
             st.success("✅ تم تجهيز البيانات بنجاح للتحليل المحاسبي.")
             st.markdown("---")
             
             # عرض لوحة التحكم (Dashboard)
             st.subheader("لوحة التحكم والملخص السريع")
+            if start is not None:
+                st.caption(f"الفترة: من {start:%Y-%m-%d} إلى {end:%Y-%m-%d}")
             
             # حساب وعرض الملخص السريع
-            income_statement = accounting_system.generate_income_statement()
-            cash_flow = accounting_system.generate_cash_flow_statement()
-            balance_sheet = accounting_system.generate_balance_sheet()
+            income_statement = accounting_system.generate_income_statement(start, end)
+            cash_flow = accounting_system.generate_cash_flow_statement(start, end)
+            balance_sheet = accounting_system.generate_balance_sheet(start, end)
             
             display_summary_metrics(income_statement, cash_flow, balance_sheet)
             
@@ -66,13 +127,13 @@ def main():
             with col2:
                 if st.button("⚖️ ميزان المراجعة", use_container_width=True):
                     with st.spinner('⚖️ جاري إنشاء ميزان المراجعة...'):
-                        trial_balance = accounting_system.generate_trial_balance()
-                        display_dataframe("ميزان المراجعة", trial_balance)
+                        trial_balance = accounting_system.generate_trial_balance(start, end)
+                        display_dataframe("ميزان المراجعة (تراكمي حتى نهاية الفترة)", trial_balance)
             
             with col3:
                 if st.button("📈 قائمة الدخل", use_container_width=True):
                     with st.spinner('📈 جاري إنشاء قائمة الدخل...'):
-                        income_statement = accounting_system.generate_income_statement()
+                        income_statement = accounting_system.generate_income_statement(start, end)
                         display_report_metrics("قائمة الدخل", income_statement)
             
             col4, col5, col6 = st.columns(3)
@@ -80,13 +141,13 @@ def main():
             with col4:
                 if st.button("💸 التدفقات النقدية", use_container_width=True):
                     with st.spinner('💸 جاري إنشاء قائمة التدفقات النقدية...'):
-                        cash_flow = accounting_system.generate_cash_flow_statement()
+                        cash_flow = accounting_system.generate_cash_flow_statement(start, end)
                         display_report_metrics("قائمة التدفقات النقدية", cash_flow)
             
             with col5:
                 if st.button("🏦 الميزانية العمومية", use_container_width=True):
                     with st.spinner('🏦 جاري إنشاء الميزانية العمومية...'):
-                        balance_sheet = accounting_system.generate_balance_sheet()
+                        balance_sheet = accounting_system.generate_balance_sheet(start, end)
                         display_report_metrics("الميزانية العمومية", balance_sheet)
             
             with col6:
@@ -119,12 +180,30 @@ def main():
                         monthly_reports = ReportGenerator.generate_monthly_reports(df)
                         display_dataframe("التقارير الشهرية", monthly_reports)
             
-            # تحليل الإيرادات (الملخص)
+            # تحليل الإيرادات (الملخص) والتقارير المقارنة
             st.markdown("---")
-            if st.button("📈 تحليل الإيرادات (ملخص)", use_container_width=True):
-                with st.spinner('📈 جاري إنشاء تحليل الإيرادات...'):
-                    revenue_analysis = ReportGenerator.generate_revenue_analysis(df)
-                    display_dataframe("تحليل الإيرادات (ملخص)", revenue_analysis)
+            col10, col11 = st.columns(2)
+            
+            with col10:
+                if st.button("📈 تحليل الإيرادات (ملخص)", use_container_width=True):
+                    with st.spinner('📈 جاري إنشاء تحليل الإيرادات...'):
+                        revenue_analysis = ReportGenerator.generate_revenue_analysis(df)
+                        display_dataframe("تحليل الإيرادات (ملخص)", revenue_analysis)
+            
+            with col11:
+                if st.button("🔁 التقارير المقارنة (شهري / سنوي)", use_container_width=True):
+                    with st.spinner('🔁 جاري إنشاء التقارير المقارنة...'):
+                        comparative_report = accounting_system.generate_comparative_report()
+                        display_dataframe("التقارير المقارنة", comparative_report)
+            
+            # دفتر الأستاذ لحساب واحد مع الرصيد الجاري
+            st.markdown("---")
+            st.subheader("📒 دفتر الأستاذ")
+            account = st.selectbox("الحساب", accounting_system.get_ledger().active_accounts())
+            if st.button("📒 عرض دفتر الأستاذ", use_container_width=True):
+                with st.spinner('📒 جاري إنشاء دفتر الأستاذ...'):
+                    account_ledger = accounting_system.generate_account_ledger(account, start, end)
+                    display_dataframe(f"دفتر الأستاذ - {account}", account_ledger)
                         
         except Exception as e:
             st.error(f"❌ حدث خطأ غير متوقع: {e}")
@@ -140,6 +219,10 @@ def main():
         - **تقارير تفصيلية:** تحليل المصروفات والإيرادات، وتقارير شهرية.
         - **واجهة مستخدم احترافية:** استخدام Streamlit لعرض النتائج بشكل جذاب ومنظم.
         """)
+    
+    with st.sidebar.expander("🧮 مؤشرات الخادم"):
+        for name, value in pipeline_cache.metrics().items():
+            st.write(f"{name}: {value}")
 
 if __name__ == "__main__":
     main()
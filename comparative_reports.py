@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+class ComparativeReportGenerator:
+    """
+    مسؤول عن التقارير المقارنة متعددة الفترات (شهر بشهر، سنة بسنة).
+    تُبنى مصفوفة الحسابات × الأشهر مرة واحدة وتُشتق منها جميع المؤشرات.
+    """
+    METRICS = [
+        'المبلغ',
+        'التغير الشهري',
+        'التغير الشهري %',
+        'التغير السنوي',
+        'التغير السنوي %',
+        'متوسط 3 أشهر',
+        'متوسط 12 شهر'
+    ]
+
+    def __init__(self, period_index):
+        self.period_index = period_index
+        self.periods, self.accounts, self.matrix = self._build_matrix()
+
+    def _build_matrix(self):
+        """
+        بناء مصفوفة الحسابات × الأشهر من المجاميع التراكمية اليومية.
+        المبلغ هو صافي حركة الحساب حسب طبيعته (المدين - الدائن للأصول والمصروفات،
+        والعكس للخصوم وحقوق الملكية والإيرادات)، وجميع المبالغ بالهللات.
+        """
+        index = self.period_index
+        if index.first_date is None:
+            return pd.PeriodIndex([], freq='M'), pd.Index([]), np.zeros((0, 0), dtype=np.int64)
+
+        periods = pd.period_range(index.first_date, index.last_date, freq='M')
+        # حدود كل شهر داخل المجاميع التراكمية
+        month_starts = np.asarray(periods.start_time.append(pd.DatetimeIndex([periods[-1].end_time])).normalize())
+        bounds = np.searchsorted(index.days, month_starts, side='left')
+        bounds[-1] = len(index.days)
+
+        debit = (index.cum_debit[bounds[1:]] - index.cum_debit[bounds[:-1]]).T
+        credit = (index.cum_credit[bounds[1:]] - index.cum_credit[bounds[:-1]]).T
+        matrix = (debit - credit) * index.normal_sign[:, None]
+
+        # الحسابات التي لها حركة فقط، ثم صفوف الإجماليات
+        active = (debit != 0).any(axis=1) | (credit != 0).any(axis=1)
+        total_revenues = matrix[index.revenue_mask].sum(axis=0)
+        total_expenses = matrix[index.expense_mask].sum(axis=0)
+        totals = np.vstack([total_revenues, total_expenses, total_revenues - total_expenses])
+
+        accounts = index.accounts[active].append(pd.Index(['إجمالي الإيرادات', 'إجمالي المصروفات', 'صافي الدخل']))
+        return periods, accounts, np.vstack([matrix[active], totals])
+
+    @staticmethod
+    def _change(matrix, lag):
+        """
+        الفرق والنسبة المئوية للتغير مقارنة بالفترة السابقة بمقدار lag.
+        """
+        previous = np.full(matrix.shape, np.nan)
+        previous[:, lag:] = matrix[:, :-lag]
+        delta = matrix - previous
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct = np.where(previous != 0, delta / np.abs(previous) * 100, np.nan)
+        return delta, pct
+
+    @staticmethod
+    def _rolling_mean(matrix, window):
+        """
+        المتوسط المتحرك على محور الأشهر (باستخدام المجاميع التراكمية).
+        الأشهر التي تسبق اكتمال النافذة تبقى فارغة (NaN) كما في rolling(window).
+        """
+        cum = np.concatenate([np.zeros((matrix.shape[0], 1)), matrix.cumsum(axis=1)], axis=1)
+        means = np.full(matrix.shape, np.nan)
+        if matrix.shape[1] >= window:
+            means[:, window - 1:] = (cum[:, window:] - cum[:, :-window]) / window
+        return means
+
+    def generate_comparative_report(self):
+        """
+        جدول محوري واحد: (الحساب، المؤشر) × الأشهر.
+        """
+        if self.matrix.size == 0:
+            return pd.DataFrame()
+
+        mom_delta, mom_pct = self._change(self.matrix, 1)
+        yoy_delta, yoy_pct = self._change(self.matrix, 12)
+        metrics = np.stack([
+            self.matrix,
+            mom_delta,
+            mom_pct,
+            yoy_delta,
+            yoy_pct,
+            self._rolling_mean(self.matrix, 3),
+            self._rolling_mean(self.matrix, 12)
+        ], axis=1)
+
+        rows = pd.MultiIndex.from_product([self.accounts, self.METRICS], names=['الحساب', 'المؤشر'])
+        report = pd.DataFrame(
+            metrics.reshape(len(rows), len(self.periods)),
+            index=rows,
+            columns=self.periods.strftime('%Y-%m')
+        )
+        return report.reset_index()
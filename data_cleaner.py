@@ -1,5 +1,6 @@
 import pandas as pd
 import streamlit as st
+from money import parse_halalas
 
 class DataCleaner:
     """
@@ -31,9 +32,8 @@ class DataCleaner:
         numeric_columns = ['مدين', 'دائن', 'الرصيد']
         for col in numeric_columns:
             if col in self.df.columns:
-                # تحويل إلى رقمي وإزالة أي فواصل أو رموز غير ضرورية
-                self.df[col] = self.df[col].astype(str).str.replace(r'[^\d\.\-]', '', regex=True)
-                self.df[col] = pd.to_numeric(self.df[col], errors='coerce').fillna(0)
+                # تحويل إلى هللات (int64) لإجراء جميع العمليات الحسابية بدقة تامة
+                self.df[col] = parse_halalas(self.df[col])
                 # **التصحيح:** التأكد من أن قيم المدين والدائن موجبة (المطلق)
                 if col in ['مدين', 'دائن']:
                     self.df[col] = self.df[col].abs()
@@ -0,0 +1,280 @@
+import numpy as np
+import pandas as pd
+
+# أنواع الحسابات
+ASSET = 'asset'
+LIABILITY = 'liability'
+EQUITY = 'equity'
+REVENUE = 'revenue'
+EXPENSE = 'expense'
+
+ACCOUNT_TYPE_NAMES = {
+    ASSET: 'أصول',
+    LIABILITY: 'خصوم',
+    EQUITY: 'حقوق ملكية',
+    REVENUE: 'إيرادات',
+    EXPENSE: 'مصروفات'
+}
+
+# الحسابات ذات الطبيعة المدينة (رصيدها = مدين - دائن)، والباقي طبيعته دائنة
+DEBIT_NORMAL_TYPES = {ASSET, EXPENSE}
+
+BANK_ACCOUNT = 'البنك'
+CAPITAL_ACCOUNT = 'حقوق ملكية'
+OPENING_ENTRY_ID = 0
+
+
+class ChartOfAccounts:
+    """
+    دليل الحسابات: رقم صحيح لكل حساب مع اسمه ونوعه.
+    """
+    DEFAULT_ACCOUNTS = [
+        (BANK_ACCOUNT, ASSET),
+        ('أصول أخرى', ASSET),
+        ('تحويلات داخلية', ASSET),
+        ('حسابات متنوعة', ASSET),
+        ('خصوم أخرى', LIABILITY),
+        (CAPITAL_ACCOUNT, EQUITY),
+        ('سحوبات نقدية', EQUITY),
+        ('إيرادات متنوعة', REVENUE),
+        ('إيرادات مبيعات', REVENUE),
+        ('إيرادات أخرى', REVENUE),
+        ('مصاريف تشغيل', EXPENSE),
+        ('مصاريف مشتريات', EXPENSE),
+        ('مصاريف ضرائب', EXPENSE),
+        ('مصاريف بنكية', EXPENSE),
+        ('مصاريف أخرى', EXPENSE)
+    ]
+
+    def __init__(self, accounts=None):
+        self.names = []
+        self.types = []
+        self._ids = {}
+        for name, account_type in (accounts or self.DEFAULT_ACCOUNTS):
+            self.add(name, account_type)
+
+    def __len__(self):
+        return len(self.names)
+
+    def add(self, name, account_type=ASSET):
+        """
+        إضافة حساب (إن لم يكن موجوداً) وإرجاع رقمه.
+        الحسابات غير المعروفة تُضاف كأصول (حساب معلق).
+        """
+        if name not in self._ids:
+            if account_type not in ACCOUNT_TYPE_NAMES:
+                raise ValueError(f"نوع حساب غير معروف: {account_type}")
+            self._ids[name] = len(self.names)
+            self.names.append(name)
+            self.types.append(account_type)
+        return self._ids[name]
+
+    def account_id(self, name):
+        return self._ids[name]
+
+    def names_of_type(self, account_type):
+        return [name for name, t in zip(self.names, self.types) if t == account_type]
+
+    def type_mask(self, *account_types):
+        """
+        مصفوفة منطقية بطول الدليل للحسابات من الأنواع المحددة.
+        """
+        return np.isin(np.asarray(self.types), account_types)
+
+    def normal_sign(self):
+        """
+        +1 للحسابات ذات الطبيعة المدينة و -1 للدائنة (لكل رقم حساب).
+        """
+        return np.where(self.type_mask(*DEBIT_NORMAL_TYPES), 1, -1)
+
+    def to_frame(self):
+        return pd.DataFrame({
+            'رقم الحساب': range(len(self.names)),
+            'الحساب': self.names,
+            'النوع': [ACCOUNT_TYPE_NAMES[t] for t in self.types]
+        })
+
+
+class Ledger:
+    """
+    دفتر القيد المزدوج: جدول قيود (قيد لكل جانب من الحركة) وجدول ترحيلات بسطر لكل طرف،
+    مفهرس بالحساب ثم التاريخ. جميع المبالغ بالهللات (int64).
+    """
+    def __init__(self, df, chart=None):
+        self.chart = chart or ChartOfAccounts()
+        date_col = '[SA]Processing Date'
+        data = self._oldest_first(df, date_col).sort_values(date_col, kind='stable')
+
+        debit = data['مدين'].to_numpy(dtype=np.int64)
+        credit = data['دائن'].to_numpy(dtype=np.int64)
+        dates = data[date_col].to_numpy()
+        self.first_date = pd.Timestamp(dates[0]) if len(dates) else None
+        self.last_date = pd.Timestamp(dates[-1]) if len(dates) else None
+
+        # 1. أرقام الحسابات (الحسابات غير الموجودة في الدليل تُضاف إليه)
+        codes, names = pd.factorize(data['الحساب المحاسبي'])
+        account_ids = np.array([self.chart.add(name) for name in names], dtype=np.int32)[codes]
+        bank_id = self.chart.account_id(BANK_ACCOUNT)
+
+        # 2. قيد لكل جانب من الحركة: المدين (البنك دائن) ثم الدائن (البنك مدين)،
+        #    فالحركة التي لها مدين ودائن معاً تُسجل بقيدين دون إسقاط أي منهما
+        debit_rows = np.flatnonzero(debit > 0)
+        credit_rows = np.flatnonzero(credit > 0)
+        order = np.argsort(np.concatenate([debit_rows * 2, credit_rows * 2 + 1]), kind='stable')
+        row_pos = np.concatenate([debit_rows, credit_rows])[order]
+        is_debit = (np.arange(len(order)) < len(debit_rows))[order]
+        amount = np.where(is_debit, debit[row_pos], credit[row_pos])
+        entry_ids = np.arange(1, len(amount) + 1)
+        entry_accounts = account_ids[row_pos]
+        entry_dates = dates[row_pos]
+
+        # 3. جدول القيود (رقم 0 للقيد الافتتاحي) والترحيلات: طرف مدين وطرف دائن لكل قيد
+        entries = pd.DataFrame({'التاريخ': entry_dates, 'الوصف': data['التفاصيل'].array.take(row_pos)},
+                               index=pd.Index(entry_ids, name='رقم القيد'))
+        zeros = np.zeros(len(amount), dtype=np.int64)
+        postings = pd.DataFrame({
+            'entry_id': np.concatenate([entry_ids, entry_ids]),
+            'leg': np.repeat(np.array([0, 1], dtype=np.int8), len(amount)),
+            'account_id': np.concatenate([np.where(is_debit, entry_accounts, bank_id),
+                                          np.where(is_debit, bank_id, entry_accounts)]).astype(np.int32),
+            'date': np.concatenate([entry_dates, entry_dates]),
+            'debit': np.concatenate([amount, zeros]),
+            'credit': np.concatenate([zeros, amount])
+        })
+
+        # رصيد البنك حسب كشف الحساب: الافتتاحي ورصيد نهاية كل يوم (للمطابقة مع الدفتر)
+        balance = data['الرصيد'].to_numpy(dtype=np.int64)
+        days = pd.DatetimeIndex(dates).normalize().to_numpy()
+        day_ends = np.append(days[1:] != days[:-1], True) if len(days) else np.zeros(0, dtype=bool)
+        self.statement_days = days[day_ends]
+        self.statement_closing = balance[day_ends]
+        self.statement_opening = int(balance[0] - credit[0] + debit[0]) if len(dates) else 0
+
+        if len(dates):
+            opening_entry = pd.DataFrame({'التاريخ': [dates[0]], 'الوصف': ['رصيد افتتاحي']},
+                                         index=pd.Index([OPENING_ENTRY_ID], name='رقم القيد'))
+            entries = pd.concat([opening_entry, entries])
+            postings = pd.concat([self._opening_legs(self.statement_opening, dates[0], bank_id), postings],
+                                 ignore_index=True)
+        self.entries = entries
+
+        # 4. الرصيد الجاري لكل حساب (تجميع واحد) ثم الفهرسة بالحساب والتاريخ
+        postings = postings.sort_values(['account_id', 'date', 'entry_id'], kind='stable')
+        signed = (postings['debit'] - postings['credit']) * self.chart.normal_sign()[postings['account_id'].to_numpy()]
+        postings['balance'] = signed.groupby(postings['account_id']).cumsum()
+        self.postings = postings.set_index(['account_id', 'date'])
+
+    @staticmethod
+    def _oldest_first(df, date_col):
+        """
+        كثير من كشوف البنوك تعرض الأحدث أولاً، والترتيب المستقر بالتاريخ يحفظ ترتيب
+        حركات اليوم الواحد كما هو؛ لذا نقلب الكشف أولاً إذا كان من الأحدث إلى الأقدم.
+        الاتجاه من التواريخ إن كانت مرتبة في اتجاه واحد، وإلا من سلسلة الرصيد الجاري
+        (الرصيد = الرصيد السابق + دائن - مدين).
+        """
+        if len(df) < 2:
+            return df
+        dates = df[date_col]
+        ascending, descending = dates.is_monotonic_increasing, dates.is_monotonic_decreasing
+        if ascending != descending:
+            return df.iloc[::-1] if descending else df
+
+        balance = df['الرصيد'].to_numpy(dtype=np.int64)
+        change = df['دائن'].to_numpy(dtype=np.int64) - df['مدين'].to_numpy(dtype=np.int64)
+        forward = np.count_nonzero(balance[1:] == balance[:-1] + change[1:])
+        backward = np.count_nonzero(balance[:-1] == balance[1:] + change[:-1])
+        return df.iloc[::-1] if backward > forward else df
+
+    def _opening_legs(self, opening_balance, date, bank_id):
+        """
+        القيد الافتتاحي: البنك مدين / حقوق الملكية دائن برصيد أول حركة.
+        """
+        capital_id = self.chart.account_id(CAPITAL_ACCOUNT)
+        dr, cr = (bank_id, capital_id) if opening_balance >= 0 else (capital_id, bank_id)
+        amount = abs(opening_balance)
+        return pd.DataFrame({
+            'entry_id': [OPENING_ENTRY_ID, OPENING_ENTRY_ID],
+            'leg': np.array([0, 1], np.int8),
+            'account_id': np.array([dr, cr], np.int32),
+            'date': [date, date],
+            'debit': np.array([amount, 0], np.int64),
+            'credit': np.array([0, amount], np.int64)
+        })
+
+    def daily_totals(self):
+        """
+        تجميع الترحيلات حسب (اليوم، الحساب) دون القيد الافتتاحي.
+        يرجع (الأيام، مصفوفة المدين، مصفوفة الدائن، المدين الافتتاحي، الدائن الافتتاحي).
+        """
+        postings = self.postings.reset_index()
+        is_opening = (postings['entry_id'] == OPENING_ENTRY_ID).to_numpy()
+
+        opening_debit = np.zeros(len(self.chart), dtype=np.int64)
+        opening_credit = np.zeros(len(self.chart), dtype=np.int64)
+        opening = postings[is_opening]
+        opening_debit[opening['account_id'].to_numpy()] = opening['debit'].to_numpy()
+        opening_credit[opening['account_id'].to_numpy()] = opening['credit'].to_numpy()
+
+        movements = postings[~is_opening]
+        day_codes, days = pd.factorize(movements['date'].dt.normalize(), sort=True)
+        totals = movements.groupby([day_codes, movements['account_id'].to_numpy()])[['debit', 'credit']].sum()
+
+        daily_debit = np.zeros((len(days), len(self.chart)), dtype=np.int64)
+        daily_credit = np.zeros((len(days), len(self.chart)), dtype=np.int64)
+        day_index = totals.index.get_level_values(0)
+        account_index = totals.index.get_level_values(1)
+        daily_debit[day_index, account_index] = totals['debit'].to_numpy()
+        daily_credit[day_index, account_index] = totals['credit'].to_numpy()
+        return days.to_numpy(), daily_debit, daily_credit, opening_debit, opening_credit
+
+    def _descriptions(self, entry_ids):
+        # أرقام القيود متتالية من الصفر فتطابق مواقعها في جدول القيود
+        return self.entries['الوصف'].array.take(entry_ids.to_numpy())
+
+    def journal(self):
+        """
+        دفتر اليومية: سطر لكل طرف من أطراف القيد مرتباً برقم القيد.
+        """
+        postings = self.postings.reset_index().sort_values(['entry_id', 'leg'], kind='stable')
+        return pd.DataFrame({
+            'رقم القيد': postings['entry_id'].to_numpy(),
+            'التاريخ': postings['date'].to_numpy(),
+            'الحساب': pd.Categorical.from_codes(postings['account_id'].to_numpy(), categories=self.chart.names),
+            'مدين': postings['debit'].to_numpy(),
+            'دائن': postings['credit'].to_numpy(),
+            'الوصف': self._descriptions(postings['entry_id'])
+        })
+
+    def account_ledger(self, account, start=None, end=None):
+        """
+        دفتر الأستاذ لحساب واحد مع الرصيد الجاري.
+        """
+        account_id = self.chart.account_id(account)
+        try:
+            rows = self.postings.loc[account_id].reset_index()
+        except KeyError:
+            rows = self.postings.iloc[:0].reset_index()
+
+        if start is not None:
+            rows = rows[rows['date'] >= pd.Timestamp(start).normalize()]
+        if end is not None:
+            rows = rows[rows['date'] < pd.Timestamp(end).normalize() + pd.Timedelta(days=1)]
+        return pd.DataFrame({
+            'التاريخ': rows['date'].to_numpy(),
+            'رقم القيد': rows['entry_id'].to_numpy(),
+            'الوصف': self._descriptions(rows['entry_id']),
+            'مدين': rows['debit'].to_numpy(),
+            'دائن': rows['credit'].to_numpy(),
+            'الرصيد': rows['balance'].to_numpy()
+        })
+
+    def active_accounts(self):
+        """
+        أسماء الحسابات التي لها ترحيلات.
+        """
+        ids = self.postings.index.get_level_values(0).unique()
+        return [self.chart.names[i] for i in sorted(ids)]
+
+    def memory_usage(self):
+        return int(self.postings.memory_usage(deep=True).sum() + self.entries.memory_usage(deep=True).sum()
+                   + self.statement_days.nbytes + self.statement_closing.nbytes)
@@ -0,0 +1,102 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# جميع المبالغ تُخزن كأعداد صحيحة (int64) بالهللة لتجنب أخطاء تقريب الأعداد العشرية،
+# ولا تُحوّل إلى ريال إلا عند العرض
+HALALAS_PER_RIYAL = 100
+
+# أعمدة المبالغ في الجداول والتقارير (تُحوّل إلى ريال عند العرض فقط)
+MONEY_COLUMNS = {
+    'مدين', 'دائن', 'الرصيد', 'المبلغ',
+    'إجمالي المدين', 'إجمالي الدائن', 'الرصيد المدين', 'الرصيد الدائن',
+    'إجمالي المصروفات', 'إجمالي الإيرادات', 'إجمالي المبلغ', 'متوسط المبلغ', 'أعلى مبلغ',
+    'إجمالي_الإيرادات', 'إجمالي_المصروفات', 'صافي_الدخل'
+}
+
+# فوق هذا الحد (بالريال) لا تكفي دقة الأعداد العشرية لتمييز نصف الهللة
+_MAX_EXACT_FLOAT = 1e10
+# المبالغ التي يقع كسر هللتها قرب النصف تُحسم من نصها بدقة تامة
+_HALF_TOLERANCE = 1e-3
+_AMOUNT_PATTERN = re.compile(r'(-?)(\d*)(?:\.(\d*))?')
+
+
+def _text_to_halalas(text):
+    """
+    تحويل نص مبلغ منظف (أرقام ونقطة وسالب فقط) إلى هللات بدقة تامة.
+    """
+    match = _AMOUNT_PATTERN.fullmatch(text)
+    if match is None:
+        return 0
+    sign, whole, fraction = match.groups()
+    if not whole and not fraction:
+        return 0
+    # أول ثلاث خانات عشرية: خانتان للهللات وخانة للتقريب
+    fraction = (fraction or '')[:3].ljust(3, '0')
+    halalas = int(whole or 0) * HALALAS_PER_RIYAL + (int(fraction) + 5) // 10
+    return -halalas if sign else halalas
+
+
+def _round_to_halalas(values, exact_texts):
+    """
+    تقريب مبالغ بالريال إلى أقرب هللة بقاعدة واحدة للمسارين الرقمي والنصي:
+    نصف الهللة يُقرّب بعيداً عن الصفر (0.125 ← 13 و -0.125 ← -13).
+    الحالات القريبة من النصف أو المبالغ الضخمة تُحسم عبر _text_to_halalas
+    على النصوص التي ترجعها exact_texts(mask).
+    """
+    scaled = np.abs(values) * HALALAS_PER_RIYAL
+    halalas = (np.sign(values) * np.floor(scaled + 0.5)).astype(np.int64)
+
+    needs_exact = (np.abs(scaled - np.floor(scaled) - 0.5) < _HALF_TOLERANCE) | (np.abs(values) >= _MAX_EXACT_FLOAT)
+    if needs_exact.any():
+        halalas[needs_exact] = [_text_to_halalas(text) for text in exact_texts(needs_exact)]
+    return halalas
+
+
+def parse_halalas(series):
+    """
+    تحويل عمود مبالغ (أرقام أو نصوص مثل '1,250.75') إلى هللات int64 بدقة تامة.
+    القيم غير الصالحة تُحوّل إلى صفر.
+    """
+    if pd.api.types.is_numeric_dtype(series):
+        # المسار السريع: الأعمدة الرقمية القادمة من Excel مباشرة
+        values = pd.to_numeric(series, errors='coerce').to_numpy(dtype=float)
+        values = np.where(np.isfinite(values), values, 0.0)
+        # أقصر تمثيل نصي للعدد هو القيمة كما أُدخلت (1.005 وليس 1.00499...)
+        halalas = _round_to_halalas(values, lambda mask: (
+            np.format_float_positional(value, trim='-') for value in values[mask]
+        ))
+        return pd.Series(halalas, index=series.index)
+
+    # إزالة أي فواصل أو رموز غير ضرورية
+    text = series.astype(str).str.replace(r'[^\d\.\-]', '', regex=True).fillna('')
+    values = pd.to_numeric(text, errors='coerce').fillna(0).to_numpy(dtype=float)
+    halalas = _round_to_halalas(values, lambda mask: text.to_numpy()[mask])
+    return pd.Series(halalas, index=series.index)
+
+
+def to_riyals(value):
+    """
+    تحويل قيمة (أو عمود) بالهللات إلى ريال للعرض.
+    """
+    return value / HALALAS_PER_RIYAL
+
+
+def to_display_frame(df):
+    """
+    نسخة للعرض والتصدير من جدول مبالغه بالهللات، بعد تحويل أعمدة المبالغ إلى ريال
+    والتقريب إلى خانتين عشريتين (التقريب بعد التحويل وليس قبله).
+    في الجداول المحورية (عمود 'المؤشر') تُحوّل صفوف المبالغ فقط دون صفوف النسب المئوية.
+    """
+    display_df = df.copy()
+    for col in display_df.columns:
+        if col in MONEY_COLUMNS and pd.api.types.is_numeric_dtype(display_df[col]):
+            display_df[col] = to_riyals(display_df[col]).round(2)
+
+    if 'المؤشر' in display_df.columns:
+        amount_rows = ~display_df['المؤشر'].astype(str).str.endswith('%')
+        value_columns = [col for col in display_df.columns if col not in ('الحساب', 'المؤشر')]
+        display_df.loc[amount_rows, value_columns] = to_riyals(display_df.loc[amount_rows, value_columns])
+        display_df[value_columns] = display_df[value_columns].round(2)
+    return display_df
@@ -0,0 +1,176 @@
+"""
+مقارنة المسار العشري (float) بمسار الهللات الصحيحة (int64) على مليون حركة.
+
+يولّد كشف حساب اصطناعي برصيد جارٍ دقيق، ثم يقيس لكل مسار:
+- زمن تحويل أعمدة المبالغ أثناء التنظيف،
+- زمن التقارير: قيود اليومية وميزان المراجعة والقوائم المالية لكامل الملف، بالنظام
+  العشري السابق (FloatAccountingSystem) وبدفتر الأستاذ بالهللات (AccountingSystem)،
+- فرق التوازن في الميزانية العمومية: رصيد الكشف الأخير مقابل الرصيد المحسوب من
+  الحركات (صفر للبيانات الاصطناعية، وأي قيمة أخرى خطأ دقة أو حركات مفقودة).
+
+الاستخدام:
+    python money_benchmark.py [--rows 1000000] [--input numeric|text]
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from accounting_system import AccountingSystem
+from money import HALALAS_PER_RIYAL, parse_halalas
+from report_generator import ReportGenerator, REVENUE_ACCOUNTS, EXPENSE_ACCOUNTS
+
+AMOUNT_COLUMNS = ['مدين', 'دائن', 'الرصيد']
+
+
+def make_statement(rows, as_text, seed=0):
+    """
+    كشف حساب اصطناعي: حسابات إيرادات ومصروفات فقط حتى تتوازن الميزانية تماماً.
+    """
+    rng = np.random.default_rng(seed)
+    account = rng.choice(REVENUE_ACCOUNTS + EXPENSE_ACCOUNTS, rows)
+    is_revenue = np.isin(account, REVENUE_ACCOUNTS)
+    halalas = rng.integers(1, 5_000_000, rows)
+
+    debit = np.where(is_revenue, 0, halalas)
+    credit = np.where(is_revenue, halalas, 0)
+    balance = 10_000_000 + np.cumsum(credit - debit)
+
+    df = pd.DataFrame({
+        '[SA]Processing Date': pd.Timestamp('2020-01-01') + pd.to_timedelta(np.sort(rng.integers(0, 1500, rows)), 'D'),
+        'التفاصيل': 'حركة',
+        'الحساب المحاسبي': account
+    })
+    for col, values in zip(AMOUNT_COLUMNS, [debit, credit, balance]):
+        riyals = values / HALALAS_PER_RIYAL
+        df[col] = pd.Series(riyals).map('{:,.2f}'.format) if as_text else riyals
+    return df
+
+
+def clean_float(df):
+    """
+    مسار التنظيف العشري السابق (float64).
+    """
+    df = df.copy()
+    for col in AMOUNT_COLUMNS:
+        df[col] = df[col].astype(str).str.replace(r'[^\d\.\-]', '', regex=True)
+        df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0)
+        if col in ['مدين', 'دائن']:
+            df[col] = df[col].abs()
+    return df
+
+
+def clean_halalas(df):
+    """
+    مسار التنظيف الجديد: هللات int64.
+    """
+    df = df.copy()
+    for col in AMOUNT_COLUMNS:
+        df[col] = parse_halalas(df[col])
+        if col in ['مدين', 'دائن']:
+            df[col] = df[col].abs()
+    return df
+
+
+class FloatAccountingSystem:
+    """
+    النظام المحاسبي العشري السابق (float64) كما كان قبل دفتر الأستاذ بالهللات:
+    قيود اليومية بحلقة iterrows، وميزان المراجعة بتجميع ودمج القيود،
+    والقوائم المالية بتصفية الحركات مباشرة.
+    """
+    def __init__(self, df):
+        self.df = df
+        self.journal_entries = None
+
+    def create_journal_entries(self):
+        if self.journal_entries is not None:
+            return self.journal_entries
+        journal_entries = []
+        for _, row in self.df.iterrows():
+            account = row['الحساب المحاسبي']
+            if row['مدين'] > 0:
+                journal_entries.append({
+                    'التاريخ': row['[SA]Processing Date'], 'الحساب المدين': account, 'الحساب الدائن': 'البنك',
+                    'المبلغ المدين': row['مدين'], 'المبلغ الدائن': row['مدين'], 'الوصف': row['التفاصيل']
+                })
+            elif row['دائن'] > 0:
+                journal_entries.append({
+                    'التاريخ': row['[SA]Processing Date'], 'الحساب المدين': 'البنك', 'الحساب الدائن': account,
+                    'المبلغ المدين': row['دائن'], 'المبلغ الدائن': row['دائن'], 'الوصف': row['التفاصيل']
+                })
+        self.journal_entries = pd.DataFrame(journal_entries)
+        return self.journal_entries
+
+    def generate_trial_balance(self):
+        journal_entries = self.create_journal_entries()
+        debit_entries = journal_entries.groupby('الحساب المدين')['المبلغ المدين'].sum().reset_index()
+        debit_entries.columns = ['الحساب', 'إجمالي المدين']
+        credit_entries = journal_entries.groupby('الحساب الدائن')['المبلغ الدائن'].sum().reset_index()
+        credit_entries.columns = ['الحساب', 'إجمالي الدائن']
+        trial_balance = pd.merge(debit_entries, credit_entries, on='الحساب', how='outer').fillna(0)
+        return ReportGenerator.finalize_trial_balance(trial_balance)
+
+    def generate_income_statement(self):
+        total_revenues = self.df.loc[self.df['الحساب المحاسبي'].isin(REVENUE_ACCOUNTS), 'دائن'].sum()
+        total_expenses = self.df.loc[self.df['الحساب المحاسبي'].isin(EXPENSE_ACCOUNTS), 'مدين'].sum()
+        return ReportGenerator.build_income_statement(total_revenues, total_expenses)
+
+    def _opening_balance(self):
+        return self.df['الرصيد'].iloc[0] - self.df['دائن'].iloc[0] + self.df['مدين'].iloc[0]
+
+    def generate_cash_flow_statement(self):
+        net_income = self.generate_income_statement()['صافي الدخل']
+        return ReportGenerator.build_cash_flow_statement(net_income, 0, 0, self._opening_balance(),
+                                                         self.df['الرصيد'].iloc[-1])
+
+    def generate_balance_sheet(self):
+        net_income = self.generate_income_statement()['صافي الدخل']
+        return ReportGenerator.build_balance_sheet(self.df['الرصيد'].iloc[-1], 0,
+                                                   self._opening_balance() + net_income)
+
+
+def run_reports(accounting_system_class, df):
+    """
+    نفس التقارير للمسارين: قيود اليومية، ميزان المراجعة، قائمة الدخل،
+    التدفقات النقدية، والميزانية العمومية لكامل الملف.
+    """
+    accounting_system = accounting_system_class(df)
+    accounting_system.create_journal_entries()
+    accounting_system.generate_trial_balance()
+    income_statement = accounting_system.generate_income_statement()
+    accounting_system.generate_cash_flow_statement()
+    balance_sheet = accounting_system.generate_balance_sheet()
+    return income_statement['صافي الدخل'], balance_sheet['فرق التوازن (يجب أن يكون صفر)']
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="مقارنة المسار العشري بمسار الهللات الصحيحة")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--input', choices=['numeric', 'text'], default='numeric')
+    args = parser.parse_args()
+
+    raw = make_statement(args.rows, args.input == 'text')
+
+    float_df, float_clean = timed(clean_float, raw)
+    (float_income, float_difference), float_reports = timed(run_reports, FloatAccountingSystem, float_df)
+
+    int_df, int_clean = timed(clean_halalas, raw)
+    (int_income, int_difference), int_reports = timed(run_reports, AccountingSystem, int_df)
+
+    print(f"عدد الحركات: {args.rows:,} (مدخلات {args.input})")
+    print(f"{'':24}{'float64':>14}{'int64 هللات':>16}")
+    print(f"{'التنظيف (ث)':24}{float_clean:14.3f}{int_clean:16.3f}")
+    print(f"{'التقارير (ث)':24}{float_reports:14.3f}{int_reports:16.3f}")
+    print(f"{'صافي الدخل (ريال)':24}{float_income:14.2f}{int_income / HALALAS_PER_RIYAL:16.2f}")
+    print(f"{'فرق التوازن (ريال)':24}{float_difference:14.2e}{int_difference / HALALAS_PER_RIYAL:16.2f}")
+
+
+if __name__ == "__main__":
+    main()
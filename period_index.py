@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+from ledger import ASSET, LIABILITY, EQUITY, REVENUE, EXPENSE, BANK_ACCOUNT
+from report_generator import ReportGenerator
+
+class PeriodIndex:
+    """
+    فهرس مجاميع تراكمية يومية لكل حساب من ترحيلات دفتر الأستاذ، للإجابة عن تقارير
+    أي فترة زمنية بطرح مجموعين تراكميين بدلاً من إعادة تصفية وتجميع الحركات.
+    """
+    def __init__(self, ledger):
+        self.chart = ledger.chart
+        self.first_date = ledger.first_date
+        self.last_date = ledger.last_date
+
+        # 1. تجميع واحد للترحيلات حسب (اليوم، الحساب)، والقيد الافتتاحي منفصلاً
+        days, daily_debit, daily_credit, self.opening_debit, self.opening_credit = ledger.daily_totals()
+        self.days = days
+
+        # رصيد البنك حسب كشف الحساب (الافتتاحي ونهاية كل يوم)
+        self.statement_days = ledger.statement_days
+        self.statement_closing = ledger.statement_closing
+        self.statement_opening = ledger.statement_opening
+
+        # 2. المجاميع التراكمية مع صف صفري في البداية (بالهللات)
+        zeros = np.zeros((1, len(self.chart)), dtype=np.int64)
+        self.cum_debit = np.vstack([zeros, daily_debit.cumsum(axis=0)])
+        self.cum_credit = np.vstack([zeros, daily_credit.cumsum(axis=0)])
+
+        self.accounts = pd.Index(self.chart.names)
+        self.normal_sign = self.chart.normal_sign()
+        self.revenue_mask = self.chart.type_mask(REVENUE)
+        self.expense_mask = self.chart.type_mask(EXPENSE)
+        self.bank_mask = self.accounts == BANK_ACCOUNT
+
+    def _bounds(self, start, end):
+        """
+        تحويل الفترة [start, end] إلى حدود الصفوف في المجاميع التراكمية.
+        """
+        lo = 0
+        hi = len(self.days)
+        if start is not None:
+            lo = np.searchsorted(self.days, np.datetime64(pd.Timestamp(start).normalize()), side='left')
+        if end is not None:
+            hi = np.searchsorted(self.days, np.datetime64(pd.Timestamp(end).normalize()), side='right')
+        return lo, max(lo, hi)
+
+    def account_totals(self, start=None, end=None):
+        """
+        إجمالي المدين والدائن لكل حساب من حركات الفترة (دون القيد الافتتاحي).
+        """
+        lo, hi = self._bounds(start, end)
+        return self.cum_debit[hi] - self.cum_debit[lo], self.cum_credit[hi] - self.cum_credit[lo]
+
+    def _balances(self, row):
+        """
+        رصيد كل حساب (حسب طبيعته) بعد القيد الافتتاحي وحركات الأيام حتى الصف row.
+        """
+        debit = self.opening_debit + self.cum_debit[row]
+        credit = self.opening_credit + self.cum_credit[row]
+        return (debit - credit) * self.normal_sign
+
+    def _statement_balance(self, date, side):
+        """
+        رصيد البنك حسب كشف الحساب في نهاية آخر يوم قبل date (side='left')
+        أو حتى date ضمناً (side='right').
+        """
+        if date is None:
+            row = 0 if side == 'left' else len(self.statement_days)
+        else:
+            row = np.searchsorted(self.statement_days, np.datetime64(pd.Timestamp(date).normalize()), side=side)
+        return self.statement_opening if row == 0 else int(self.statement_closing[row - 1])
+
+    def _net_income(self, debit, credit):
+        revenues = (credit - debit)[self.revenue_mask].sum()
+        expenses = (debit - credit)[self.expense_mask].sum()
+        return revenues, expenses
+
+    def generate_trial_balance(self, start=None, end=None):
+        """
+        ميزان المراجعة التراكمي حتى نهاية الفترة (القيد الافتتاحي وجميع الحركات حتى end)،
+        بنفس أساس الميزانية العمومية؛ بداية الفترة لا تؤثر عليه.
+        """
+        _, hi = self._bounds(start, end)
+        debit = self.opening_debit + self.cum_debit[hi]
+        credit = self.opening_credit + self.cum_credit[hi]
+        active = (debit > 0) | (credit > 0)
+
+        trial_balance = pd.DataFrame({
+            'الحساب': self.accounts[active],
+            'إجمالي المدين': debit[active],
+            'إجمالي الدائن': credit[active]
+        })
+        return ReportGenerator.finalize_trial_balance(trial_balance)
+
+    def generate_income_statement(self, start=None, end=None):
+        """
+        قائمة الدخل للفترة.
+        """
+        debit, credit = self.account_totals(start, end)
+        return ReportGenerator.build_income_statement(*self._net_income(debit, credit))
+
+    def generate_cash_flow_statement(self, start=None, end=None):
+        """
+        قائمة التدفقات النقدية للفترة: التشغيلية من صافي الدخل، والاستثمارية من حركة
+        الأصول الأخرى، والتمويلية من حركة الخصوم وحقوق الملكية. رصيدا البداية والنهاية
+        من عمود الرصيد في كشف الحساب، فيظهر أي فرق بينهما وبين صافي التدفقات.
+        """
+        debit, credit = self.account_totals(start, end)
+        revenues, expenses = self._net_income(debit, credit)
+
+        other_assets = self.chart.type_mask(ASSET) & ~self.bank_mask
+        financing_accounts = self.chart.type_mask(LIABILITY, EQUITY)
+        investing_cash_flow = (credit - debit)[other_assets].sum()
+        financing_cash_flow = (credit - debit)[financing_accounts].sum()
+
+        opening_balance = self._statement_balance(start, 'left')
+        closing_balance = self._statement_balance(end, 'right')
+        return ReportGenerator.build_cash_flow_statement(revenues - expenses, investing_cash_flow, financing_cash_flow,
+                                                         opening_balance, closing_balance)
+
+    def generate_balance_sheet(self, start=None, end=None):
+        """
+        الميزانية العمومية في نهاية الفترة (أرصدة تراكمية منذ القيد الافتتاحي).
+        رصيد البنك من كشف الحساب وباقي الحسابات من الدفتر، ففرق التوازن هو الفرق
+        بين رصيد الكشف والرصيد المحسوب من الحركات.
+        """
+        _, hi = self._bounds(start, end)
+        balances = self._balances(hi)
+        revenues, expenses = self._net_income(self.cum_debit[hi], self.cum_credit[hi])
+
+        other_assets = self.chart.type_mask(ASSET) & ~self.bank_mask
+        total_assets = self._statement_balance(end, 'right') + balances[other_assets].sum()
+        total_liabilities = balances[self.chart.type_mask(LIABILITY)].sum()
+        # حقوق الملكية = رأس المال والسحوبات + صافي الدخل المتراكم
+        total_equity = balances[self.chart.type_mask(EQUITY)].sum() + revenues - expenses
+        return ReportGenerator.build_balance_sheet(total_assets, total_liabilities, total_equity)
+
+    def memory_usage(self):
+        """
+        حجم الفهرس في الذاكرة بالبايت.
+        """
+        return int(self.cum_debit.nbytes + self.cum_credit.nbytes
+                   + self.statement_days.nbytes + self.statement_closing.nbytes)
@@ -0,0 +1,288 @@
+import hashlib
+import itertools
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+
+def _enable_copy_on_write():
+    """
+    تفعيل النسخ عند الكتابة حتى تكون المشاركة بدون نسخ آمنة بين الجلسات
+    (مفعّل افتراضياً في pandas 3، ونفعّله صراحةً في الإصدارات الأقدم).
+    تُستدعى عند إنشاء أول نتيجة حتى لا تُستورد pandas عند بدء التطبيق.
+    """
+    import pandas as pd
+    if int(pd.__version__.split('.')[0]) >= 3:
+        # الخيار مهمل في pandas 3 وتغييره يطلق تحذيراً
+        return
+    try:
+        pd.set_option('mode.copy_on_write', True)
+    except (KeyError, ValueError, pd.errors.OptionError):
+        pass
+
+
+class PipelineResult:
+    """
+    نتيجة خط المعالجة لملف واحد (البيانات المنظفة والمصنفة + النظام المحاسبي).
+    تُعامل كبيانات للقراءة فقط لأنها مشتركة بين جميع الجلسات.
+    """
+    def __init__(self, df, accounting_system):
+        _enable_copy_on_write()
+        self.df = df
+        self.accounting_system = accounting_system
+        self.size_bytes = self._estimate_size()
+
+    def _estimate_size(self):
+        """
+        تقدير حجم النتيجة في الذاكرة بالبايت.
+        """
+        size = int(self.df.memory_usage(deep=True).sum()) if self.df is not None else 0
+        journal_entries = self.accounting_system.journal_entries
+        if journal_entries is not None:
+            size += int(journal_entries.memory_usage(deep=True).sum())
+        if self.accounting_system.ledger is not None:
+            size += self.accounting_system.ledger.memory_usage()
+        if self.accounting_system.period_index is not None:
+            size += self.accounting_system.period_index.memory_usage()
+        return size
+
+    def session_view(self):
+        """
+        نسخة سطحية (بدون نسخ البيانات) من الجدول لاستخدامها داخل الجلسة.
+        أي تعديل عليها لا يؤثر على النسخة المشتركة بفضل النسخ عند الكتابة.
+        """
+        return self.df.copy(deep=False)
+
+
+def _remove_spill_files(spilled, owned_dir):
+    """
+    حذف ملفات القرص التي كتبها المخزن فقط، ثم المجلد المؤقت إن كان المخزن هو من أنشأه.
+    """
+    for path in list(spilled.values()):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+    if owned_dir is not None:
+        shutil.rmtree(owned_dir, ignore_errors=True)
+
+
+class PipelineCache:
+    """
+    مخزن مشترك على مستوى العملية لنتائج خط المعالجة، مفهرس ببصمة محتوى الملف.
+    يطبق حداً أقصى للذاكرة مع إخراج الأقدم استخداماً (LRU) إلى القرص.
+    """
+    def __init__(self, max_bytes, spill_dir=None, session_ttl=1800):
+        self.max_bytes = max_bytes
+        owned_dir = None
+        if spill_dir is None:
+            spill_dir = owned_dir = tempfile.mkdtemp(prefix='pipeline_cache_')
+        else:
+            os.makedirs(spill_dir, exist_ok=True)
+        self.spill_dir = spill_dir
+        self.session_ttl = session_ttl
+
+        self._entries = OrderedDict()   # key -> PipelineResult (في الذاكرة)
+        self._spilling = {}             # key -> (PipelineResult، المسار) أُخرج من الذاكرة ويُكتب الآن إلى القرص
+        self._spilled = {}              # key -> مسار الملف على القرص
+        self._key_locks = {}            # key -> [قفل البناء أو التحميل من القرص، عدد المنتظرين]
+        self._sessions = {}             # session_id -> آخر نشاط
+        self._lock = threading.Lock()
+        self._memory_bytes = 0
+        self._spill_ids = itertools.count()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_loads = 0
+        self.spill_failures = 0
+
+        # عند انتهاء المخزن أو الخروج من العملية: حذف ملفاته فقط، ومجلده إن كان مؤقتاً
+        self._finalizer = weakref.finalize(self, _remove_spill_files, self._spilled, owned_dir)
+
+    @staticmethod
+    def content_hash(data):
+        """
+        حساب بصمة SHA-256 لمحتوى الملف المرفوع.
+        """
+        return hashlib.sha256(data).hexdigest()
+
+    def touch_session(self, session_id):
+        """
+        تسجيل نشاط الجلسة لاحتساب عدد الجلسات النشطة.
+        """
+        now = time.time()
+        with self._lock:
+            self._sessions[session_id] = now
+            expired = [sid for sid, seen in self._sessions.items() if now - seen > self.session_ttl]
+            for sid in expired:
+                del self._sessions[sid]
+
+    def get_or_build(self, key, builder):
+        """
+        إرجاع النتيجة المخزنة للمفتاح، أو بناؤها مرة واحدة عبر builder ثم تخزينها.
+        كل استدعاء يُحتسب إصابة أو إخفاقاً مرة واحدة فقط.
+        """
+        with self._lock:
+            result = self._take_from_memory(key)
+            if result is not None:
+                self.hits += 1
+                to_spill = self._evict()
+        if result is not None:
+            self._spill_all(to_spill)
+            return result
+
+        with self._lock:
+            # قفل لكل مفتاح حتى لا تبني أو تحمّل عدة جلسات نفس الملف في الوقت ذاته،
+            # ويبقى مسجلاً ما دام هناك من ينتظره
+            key_lock = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            key_lock[1] += 1
+
+        try:
+            result, to_spill = self._load_or_build(key, key_lock[0], builder)
+        finally:
+            with self._lock:
+                key_lock[1] -= 1
+                if key_lock[1] == 0:
+                    del self._key_locks[key]
+        self._spill_all(to_spill)
+        return result
+
+    def _load_or_build(self, key, key_lock, builder):
+        """
+        تحميل المفتاح من القرص أو بناؤه مع الإمساك بقفل المفتاح.
+        يرجع (النتيجة، العناصر المطلوب إخراجها إلى القرص).
+        """
+        with key_lock:
+            with self._lock:
+                result = self._take_from_memory(key)
+                path = self._spilled.get(key)
+            if result is not None:
+                source = 'memory'
+            elif path is not None:
+                # يبقى المفتاح مسجلاً على القرص حتى يكتمل التحميل تحت قفل المفتاح
+                with open(path, 'rb') as f:
+                    result = pickle.load(f)
+                source = 'disk'
+            else:
+                result = builder()
+                source = 'build'
+
+            to_spill = []
+            with self._lock:
+                if source == 'build':
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                if source == 'disk':
+                    del self._spilled[key]
+                    self.disk_loads += 1
+                if source != 'memory' and result is not None:
+                    self._insert(key, result)
+                to_spill = self._evict()
+            if source == 'disk':
+                self._remove_file(path)
+        return result, to_spill
+
+    def _take_from_memory(self, key):
+        """
+        البحث عن المفتاح في الذاكرة، بما فيها العناصر التي تُكتب إلى القرص الآن
+        (تُستعاد إلى الذاكرة ويُلغى إخراجها). يُستدعى مع الإمساك بالقفل.
+        """
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            return self._entries[key]
+        result, _ = self._spilling.pop(key, (None, None))
+        if result is not None:
+            self._entries[key] = result
+            self._memory_bytes += result.size_bytes
+        return result
+
+    def _insert(self, key, result):
+        """
+        إضافة نتيجة إلى الذاكرة كأحدث عنصر. يُستدعى مع الإمساك بالقفل.
+        """
+        if key in self._entries:
+            self._memory_bytes -= self._entries[key].size_bytes
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        self._memory_bytes += result.size_bytes
+
+    def _evict(self):
+        """
+        اختيار الأقدم استخداماً للإخراج إذا تجاوزنا الحد.
+        يُستدعى مع الإمساك بالقفل ويرجع العناصر المطلوب كتابتها إلى القرص.
+        """
+        to_spill = []
+        # نبقي العنصر الأحدث في الذاكرة دائماً حتى لو تجاوز الحد وحده
+        while self._memory_bytes > self.max_bytes and len(self._entries) > 1:
+            old_key, old_result = self._entries.popitem(last=False)
+            self._memory_bytes -= old_result.size_bytes
+            # مسار فريد لكل إخراج حتى لا تتداخل كتابتان لنفس المفتاح
+            path = os.path.join(self.spill_dir, f"{old_key}-{next(self._spill_ids)}.pkl")
+            self._spilling[old_key] = (old_result, path)
+            to_spill.append((old_key, old_result, path))
+        return to_spill
+
+    def _spill_all(self, to_spill):
+        for key, result, path in to_spill:
+            self._spill(key, result, path)
+
+    def _spill(self, key, result, path):
+        """
+        كتابة نتيجة مُخرجة من الذاكرة إلى القرص خارج القفل.
+        إذا فشلت الكتابة تبقى النتيجة في الذاكرة بدلاً من فقدانها.
+        """
+        try:
+            with open(path, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            self._remove_file(path)
+            with self._lock:
+                self.spill_failures += 1
+                if self._spilling.get(key, (None, None))[1] == path:
+                    del self._spilling[key]
+                    self._entries[key] = result
+                    self._entries.move_to_end(key, last=False)
+                    self._memory_bytes += result.size_bytes
+            return
+
+        with self._lock:
+            # إذا طُلب المفتاح أثناء الكتابة فقد عاد إلى الذاكرة ولا حاجة للملف
+            spilled = self._spilling.get(key, (None, None))[1] == path
+            if spilled:
+                del self._spilling[key]
+                self._spilled[key] = path
+                self.evictions += 1
+        if not spilled:
+            self._remove_file(path)
+
+    @staticmethod
+    def _remove_file(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def metrics(self):
+        """
+        مؤشرات المخزن: الجلسات النشطة، حجم الذاكرة، وعمليات الإخراج.
+        """
+        with self._lock:
+            return {
+                'الجلسات النشطة': len(self._sessions),
+                'عناصر في الذاكرة': len(self._entries) + len(self._spilling),
+                'عناصر على القرص': len(self._spilled),
+                'حجم الذاكرة (ميجابايت)': round(self._memory_bytes / 1024 ** 2, 2),
+                'الحد الأقصى (ميجابايت)': round(self.max_bytes / 1024 ** 2, 2),
+                'مرات الإصابة': self.hits,
+                'مرات الإخفاق': self.misses,
+                'مرات الإخراج': self.evictions,
+                'مرات التحميل من القرص': self.disk_loads,
+                'مرات فشل الكتابة على القرص': self.spill_failures,
+            }
@@ -1,42 +1,33 @@
 import pandas as pd
 import numpy as np
+from ledger import ChartOfAccounts, REVENUE, EXPENSE
+
+# قوائم الحسابات من دليل الحسابات الافتراضي
+_CHART = ChartOfAccounts()
+EXPENSE_ACCOUNTS = _CHART.names_of_type(EXPENSE)
+REVENUE_ACCOUNTS = _CHART.names_of_type(REVENUE)
 
 class ReportGenerator:
     """
     مسؤول عن توليد التقارير المحاسبية المختلفة من البيانات المصنفة.
+    القوائم المالية وميزان المراجعة تُحسب من دفتر الأستاذ (PeriodIndex) وتُبنى هنا.
+    جميع الدوال ثابتة (static) ولا تحتاج إلى إنشاء كائن.
     """
-    def __init__(self, df):
-        self.df = df
-        self.expense_accounts = ['مصاريف تشغيل', 'مصاريف مشتريات', 'مصاريف ضرائب', 'مصاريف بنكية', 'مصاريف أخرى']
-        self.revenue_accounts = ['إيرادات متنوعة', 'إيرادات مبيعات', 'إيرادات أخرى']
-        self.asset_accounts = ['البنك', 'أصول أخرى']
-        self.liability_accounts = ['خصوم أخرى']
-        self.equity_accounts = ['حقوق ملكية']
-
-    def generate_trial_balance(self, journal_entries):
+    @staticmethod
+    def finalize_trial_balance(trial_balance):
         """
-        إنشاء ميزان المراجعة من قيود اليومية.
+        حساب أرصدة ميزان المراجعة وإضافة صف الإجماليات.
         """
-        # 1. تجميع الحركات المدينة والدائنة لكل حساب
-        debit_entries = journal_entries.groupby('الحساب المدين')['المبلغ المدين'].sum().reset_index()
-        debit_entries.columns = ['الحساب', 'إجمالي المدين']
-        
-        credit_entries = journal_entries.groupby('الحساب الدائن')['المبلغ الدائن'].sum().reset_index()
-        credit_entries.columns = ['الحساب', 'إجمالي الدائن']
-        
-        # 2. دمج الحسابات
-        trial_balance = pd.merge(debit_entries, credit_entries, on='الحساب', how='outer').fillna(0)
-        
-        # 3. حساب الرصيد
+        # 1. حساب الرصيد
         trial_balance['الرصيد المدين'] = np.where(trial_balance['إجمالي المدين'] >= trial_balance['إجمالي الدائن'], 
                                                   trial_balance['إجمالي المدين'] - trial_balance['إجمالي الدائن'], 0)
         trial_balance['الرصيد الدائن'] = np.where(trial_balance['إجمالي الدائن'] > trial_balance['إجمالي المدين'], 
                                                   trial_balance['إجمالي الدائن'] - trial_balance['إجمالي المدين'], 0)
         
-        # 4. تجميع نهائي
+        # 2. تجميع نهائي
         final_tb = trial_balance[['الحساب', 'إجمالي المدين', 'إجمالي الدائن', 'الرصيد المدين', 'الرصيد الدائن']]
         
-        # 5. إضافة الإجماليات
+        # 3. إضافة الإجماليات
         totals = pd.DataFrame({
             'الحساب': ['الإجمالي'],
             'إجمالي المدين': [final_tb['إجمالي المدين'].sum()],
@@ -48,18 +39,11 @@ class ReportGenerator:
         final_tb = pd.concat([final_tb, totals], ignore_index=True)
         return final_tb
 
-    def generate_income_statement(self):
+    @staticmethod
+    def build_income_statement(total_revenues, total_expenses):
         """
-        إنشاء قائمة الدخل (الإيرادات والمصروفات).
+        بناء قائمة الدخل من إجمالي الإيرادات والمصروفات.
         """
-        # الإيرادات
-        revenue_data = self.df[self.df['الحساب المحاسبي'].isin(self.revenue_accounts)]
-        total_revenues = revenue_data['دائن'].sum()
-        
-        # المصروفات
-        expense_data = self.df[self.df['الحساب المحاسبي'].isin(self.expense_accounts)]
-        total_expenses = expense_data['مدين'].sum()
-        
         net_income = total_revenues - total_expenses
         
         report = {
@@ -73,28 +57,14 @@ class ReportGenerator:
         }
         return report
 
-    def generate_cash_flow_statement(self):
+    @staticmethod
+    def build_cash_flow_statement(operating_cash_flow, investing_cash_flow, financing_cash_flow,
+                                  opening_balance, closing_balance):
         """
-        إنشاء قائمة التدفقات النقدية (بافتراض الطريقة المباشرة المبسطة).
+        بناء قائمة التدفقات النقدية (الطريقة المباشرة المبسطة).
         """
-        # التدفقات التشغيلية (الفرق بين الإيرادات والمصروفات النقدية)
-        income_statement = self.generate_income_statement()
-        operating_cash_flow = income_statement['صافي الدخل']
-        
-        # التدفقات الاستثمارية (افتراض عدم وجود حركات استثمارية معقدة)
-        investing_cash_flow = 0
-        
-        # التدفقات التمويلية (افتراض عدم وجود حركات تمويلية معقدة)
-        financing_cash_flow = 0
-        
         net_cash_flow = operating_cash_flow + investing_cash_flow + financing_cash_flow
         
-        # الرصيد النقدي في بداية الفترة
-        opening_balance = self.df['الرصيد'].iloc[0] - self.df['دائن'].iloc[0] + self.df['مدين'].iloc[0] if not self.df.empty else 0
-        
-        # الرصيد النقدي في نهاية الفترة
-        closing_balance = self.df['الرصيد'].iloc[-1] if not self.df.empty else 0
-        
         report = {
             'الرصيد النقدي في بداية الفترة': opening_balance,
             'التدفقات النقدية من الأنشطة التشغيلية': operating_cash_flow,
@@ -105,23 +75,11 @@ class ReportGenerator:
         }
         return report
 
-    def generate_balance_sheet(self):
+    @staticmethod
+    def build_balance_sheet(total_assets, total_liabilities, total_equity):
         """
-        إنشاء الميزانية العمومية (المركز المالي).
+        بناء الميزانية العمومية (المركز المالي).
         """
-        # الأصول (رصيد البنك النهائي)
-        total_assets = self.df['الرصيد'].iloc[-1] if not self.df.empty else 0
-        
-        # حقوق الملكية (رأس المال + صافي الدخل)
-        net_income = self.generate_income_statement()['صافي الدخل']
-        # نفترض أن رأس المال هو الرصيد الافتتاحي
-        opening_balance = self.df['الرصيد'].iloc[0] - self.df['دائن'].iloc[0] + self.df['مدين'].iloc[0] if not self.df.empty else 0
-        
-        total_equity = opening_balance + net_income
-        
-        # الخصوم (افتراض صفر لتبسيط التحليل البنكي)
-        total_liabilities = 0
-        
         # التأكد من التوازن (الأصول = الخصوم + حقوق الملكية)
         difference = total_assets - (total_liabilities + total_equity)
         
@@ -138,11 +96,12 @@ class ReportGenerator:
         }
         return report
 
-    def generate_expense_analysis(self, df):
+    @staticmethod
+    def generate_expense_analysis(df):
         """
         تحليل المصروفات حسب الحسابات.
         """
-        expense_df = df[df['الحساب المحاسبي'].isin(self.expense_accounts)]
+        expense_df = df[df['الحساب المحاسبي'].isin(EXPENSE_ACCOUNTS)]
         
         if expense_df.empty:
             return pd.DataFrame({'الحساب': ['لا توجد بيانات للمصروفات'], 'إجمالي المبلغ': [0], 'عدد الحركات': [0]})
@@ -157,11 +116,12 @@ class ReportGenerator:
         analysis.columns = ['الحساب', 'إجمالي المصروفات', 'عدد الحركات', 'متوسط المبلغ', 'أعلى مبلغ']
         return analysis
 
-    def generate_revenue_analysis(self, df):
+    @staticmethod
+    def generate_revenue_analysis(df):
         """
         تحليل الإيرادات حسب الحسابات.
         """
-        revenue_df = df[df['الحساب المحاسبي'].isin(self.revenue_accounts)]
+        revenue_df = df[df['الحساب المحاسبي'].isin(REVENUE_ACCOUNTS)]
         
         if revenue_df.empty:
             return pd.DataFrame({'الحساب': ['لا توجد بيانات للإيرادات'], 'إجمالي المبلغ': [0], 'عدد الحركات': [0]})
@@ -181,9 +141,7 @@ class ReportGenerator:
         """
         تقرير تفصيلي لحركات المصروفات.
         """
-        expense_accounts = ['مصاريف تشغيل', 'مصاريف مشتريات', 'مصاريف ضرائب', 'مصاريف بنكية', 'مصاريف أخرى']
-        
-        expense_df = df[df['الحساب المحاسبي'].isin(expense_accounts)].copy()
+        expense_df = df[df['الحساب المحاسبي'].isin(EXPENSE_ACCOUNTS)].copy()
         
         if expense_df.empty:
             return pd.DataFrame({'التاريخ': [], 'الوصف_الأصلي_للحركة': [], 'الحساب المحاسبي': [], 'المبلغ': []})
@@ -205,9 +163,7 @@ class ReportGenerator:
         """
         تقرير تفصيلي لحركات الإيرادات.
         """
-        revenue_accounts = ['إيرادات متنوعة', 'إيرادات مبيعات', 'إيرادات أخرى']
-        
-        revenue_df = df[df['الحساب المحاسبي'].isin(revenue_accounts)].copy()
+        revenue_df = df[df['الحساب المحاسبي'].isin(REVENUE_ACCOUNTS)].copy()
         
         if revenue_df.empty:
             return pd.DataFrame({'التاريخ': [], 'الوصف_الأصلي_للحركة': [], 'الحساب المحاسبي': [], 'المبلغ': []})
@@ -232,10 +188,11 @@ class ReportGenerator:
         if '[SA]Processing Date' not in df.columns:
             return pd.DataFrame()
             
-        df['الشهر-السنة'] = df['[SA]Processing Date'].dt.to_period('M')
+        # التجميع على سلسلة مستقلة بدلاً من إضافة عمود إلى الجدول الأصلي
+        periods = df['[SA]Processing Date'].dt.to_period('M').rename('الشهر-السنة')
         
         # تجميع الإيرادات والمصروفات شهرياً
-        monthly_data = df.groupby('الشهر-السنة').agg(
+        monthly_data = df.groupby(periods).agg(
             إجمالي_الإيرادات=('دائن', 'sum'),
             إجمالي_المصروفات=('مدين', 'sum')
         ).reset_index()
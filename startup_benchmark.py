@@ -0,0 +1,105 @@
+"""
+قياس زمن البدء البارد للتطبيق حتى ظهور شاشة رفع الملف.
+
+يشغّل app.py عدة مرات في عمليات جديدة مع ``python -X importtime`` ويعرض
+زمن الاستيراد لكل وحدة، ثم يفشل (رمز خروج 1) إذا:
+- استورد التطبيق إحدى الوحدات المؤجلة (pandas، fpdf، openpyxl، وحدات التقارير) قبل رفع ملف
+  (الوحدات التي يستوردها streamlit نفسه عند استيراده لا تُحتسب على التطبيق)، أو
+- زاد زمن البدء عن زمن استيراد streamlit وحده بأكثر من الحد المسموح.
+
+الاستخدام:
+    python startup_benchmark.py [--runs 5] [--max-overhead-ms 300]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# وحدات يجب ألا تُحمّل قبل رفع الملف
+DEFERRED_MODULES = [
+    'pandas', 'numpy', 'fpdf', 'openpyxl', 'money',
+    'accounting_system', 'ledger', 'report_generator', 'period_index', 'comparative_reports',
+    'data_loader', 'data_cleaner', 'transaction_classifier'
+]
+
+APP_SCRIPT = "import runpy; runpy.run_path('app.py', run_name='__main__')"
+BASELINE_SCRIPT = "import streamlit"
+
+
+def run_cold(script):
+    """
+    تشغيل السكربت في عملية جديدة وإرجاع (الزمن بالثواني، أزمنة الاستيراد لكل وحدة).
+    """
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', script],
+                          cwd=APP_DIR, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+
+    imports = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # الوحدات المتداخلة تُزاح بمسافات إضافية بعد الفاصل
+        is_top_level = name[1:] == name.strip()
+        imports[name.strip()] = (int(cumulative_us), is_top_level)
+    return elapsed, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="قياس زمن البدء البارد لشاشة رفع الملف")
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--max-overhead-ms', type=float, default=300.0,
+                        help="أقصى زيادة مسموحة فوق زمن استيراد streamlit وحده")
+    parser.add_argument('--top', type=int, default=15)
+    args = parser.parse_args()
+
+    baseline_times, app_times = [], []
+    baseline_imports, app_imports = set(), {}
+    for _ in range(args.runs):
+        elapsed, imports = run_cold(BASELINE_SCRIPT)
+        baseline_times.append(elapsed)
+        baseline_imports.update(imports)
+        elapsed, app_imports = run_cold(APP_SCRIPT)
+        app_times.append(elapsed)
+
+    baseline = statistics.median(baseline_times)
+    startup = statistics.median(app_times)
+    overhead_ms = (startup - baseline) * 1000
+
+    print("زمن الاستيراد التراكمي للوحدات (المستوى الأعلى، آخر تشغيل):")
+    top_level = sorted(((us, name) for name, (us, is_top) in app_imports.items() if is_top), reverse=True)
+    for us, name in top_level[:args.top]:
+        print(f"  {us / 1000:9.1f} ms  {name}")
+    print()
+    print(f"استيراد streamlit وحده : {baseline * 1000:9.1f} ms")
+    print(f"البدء حتى شاشة الرفع   : {startup * 1000:9.1f} ms")
+    print(f"الزيادة الخاصة بالتطبيق : {overhead_ms:9.1f} ms (الحد {args.max_overhead_ms:.0f} ms)")
+
+    failures = []
+    # بعض إصدارات streamlit تستورد pandas/numpy بنفسها، فلا نحاسب التطبيق إلا على ما يضيفه
+    loaded = [name for name in DEFERRED_MODULES if name in app_imports and name not in baseline_imports]
+    preloaded = [name for name in DEFERRED_MODULES if name in baseline_imports]
+    if preloaded:
+        print(f"وحدات مؤجلة يستوردها streamlit نفسه (لا تُحتسب): {', '.join(preloaded)}")
+    if loaded:
+        failures.append(f"وحدات مؤجلة استُوردت عند البدء: {', '.join(loaded)}")
+    if overhead_ms > args.max_overhead_ms:
+        failures.append(f"زمن البدء تجاوز الحد: {overhead_ms:.1f} ms > {args.max_overhead_ms:.0f} ms")
+
+    if failures:
+        for failure in failures:
+            print(f"❌ {failure}")
+        sys.exit(1)
+    print("✅ زمن البدء ضمن الحد")
+
+
+if __name__ == "__main__":
+    main()
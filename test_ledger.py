@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from accounting_system import AccountingSystem
+from ledger import Ledger, OPENING_ENTRY_ID
+
+DIFFERENCE = 'فرق التوازن (يجب أن يكون صفر)'
+
+
+def make_statement(rows, opening_balance=1000):
+    """
+    كشف حساب صغير بالهللات برصيد جارٍ متسق مع الحركات.
+    rows: قائمة (التاريخ، الحساب، مدين، دائن).
+    """
+    dates, accounts, debit, credit = zip(*rows)
+    balance = opening_balance + np.cumsum(np.array(credit) - np.array(debit))
+    return pd.DataFrame({
+        '[SA]Processing Date': pd.to_datetime(dates),
+        'التفاصيل': [f'حركة {i}' for i in range(len(rows))],
+        'الحساب المحاسبي': list(accounts),
+        'مدين': np.array(debit, dtype=np.int64),
+        'دائن': np.array(credit, dtype=np.int64),
+        'الرصيد': balance.astype(np.int64)
+    })
+
+
+@pytest.fixture
+def statement():
+    return make_statement([
+        ('2024-01-05', 'إيرادات مبيعات', 0, 500),
+        ('2024-01-20', 'مصاريف تشغيل', 120, 0),
+        ('2024-02-03', 'أصول أخرى', 200, 0),
+        ('2024-02-15', 'خصوم أخرى', 0, 300),
+        ('2024-02-15', 'مصاريف بنكية', 50, 30),
+        ('2024-03-01', 'سحوبات نقدية', 100, 0),
+        ('2024-03-10', 'إيرادات أخرى', 0, 75),
+    ])
+
+
+def test_row_with_debit_and_credit_posts_both_sides():
+    df = make_statement([
+        ('2024-01-01', 'إيرادات مبيعات', 0, 100),
+        ('2024-01-02', 'مصاريف تشغيل', 50, 30),
+        ('2024-01-03', 'إيرادات مبيعات', 0, 0),
+    ])
+    accounting_system = AccountingSystem(df)
+    balance_sheet = accounting_system.generate_balance_sheet()
+
+    assert df['الرصيد'].iloc[-1] == 1080
+    assert balance_sheet['الأصول']['إجمالي الأصول'] == 1080
+    assert balance_sheet[DIFFERENCE] == 0
+    assert accounting_system.generate_income_statement()['المصروفات']['إجمالي المصروفات'] == 20
+
+
+def test_statement_discrepancy_shows_in_balance_sheet(statement):
+    statement.loc[statement.index[-1], 'الرصيد'] += 30
+    balance_sheet = AccountingSystem(statement).generate_balance_sheet()
+    cash_flow = AccountingSystem(statement).generate_cash_flow_statement()
+
+    assert balance_sheet[DIFFERENCE] == 30
+    assert cash_flow['الرصيد النقدي في نهاية الفترة'] == statement['الرصيد'].iloc[-1]
+    assert (cash_flow['الرصيد النقدي في بداية الفترة'] + cash_flow['صافي الزيادة (النقص) في النقد'] + 30
+            == cash_flow['الرصيد النقدي في نهاية الفترة'])
+
+
+def test_journal_entries_balance(statement):
+    journal = Ledger(statement).journal()
+    per_entry = journal.groupby('رقم القيد')[['مدين', 'دائن']].sum()
+
+    assert (per_entry['مدين'] == per_entry['دائن']).all()
+    assert per_entry.index[0] == OPENING_ENTRY_ID
+    assert len(per_entry) == 1 + (statement['مدين'] > 0).sum() + (statement['دائن'] > 0).sum()
+
+
+@pytest.mark.parametrize('start, end', [
+    (None, None), ('2024-01-01', '2024-01-31'), ('2024-02-01', '2024-02-29'), ('2024-02-10', None),
+])
+def test_cash_flow_reconciles_to_statement(statement, start, end):
+    cash_flow = AccountingSystem(statement).generate_cash_flow_statement(start, end)
+
+    assert (cash_flow['الرصيد النقدي في بداية الفترة'] + cash_flow['صافي الزيادة (النقص) في النقد']
+            == cash_flow['الرصيد النقدي في نهاية الفترة'])
+
+
+@pytest.mark.parametrize('end', [None, '2024-01-31', '2024-02-15', '2024-03-05'])
+def test_balance_sheet_balances_at_any_end(statement, end):
+    assert AccountingSystem(statement).generate_balance_sheet(None, end)[DIFFERENCE] == 0
+
+
+def test_trial_balance_is_cumulative_to_end(statement):
+    accounting_system = AccountingSystem(statement)
+    full = accounting_system.generate_trial_balance(None, '2024-02-29')
+    february = accounting_system.generate_trial_balance('2024-02-01', '2024-02-29')
+    totals = full.iloc[-1]
+
+    pd.testing.assert_frame_equal(full, february)
+    assert totals['إجمالي المدين'] == totals['إجمالي الدائن']
+    assert totals['الرصيد المدين'] == totals['الرصيد الدائن']
+    bank = full.set_index('الحساب').loc['البنك']
+    assert bank['الرصيد المدين'] == statement.loc[statement['[SA]Processing Date'] <= '2024-02-29', 'الرصيد'].iloc[-1]
+
+
+def test_period_income_statements_add_up(statement):
+    accounting_system = AccountingSystem(statement)
+    net = lambda start, end: accounting_system.generate_income_statement(start, end)['صافي الدخل']
+
+    assert net('2024-01-01', '2024-01-31') + net('2024-02-01', '2024-03-31') == net(None, None)
+
+
+def _assert_same_reports(actual, expected):
+    assert actual.generate_balance_sheet() == expected.generate_balance_sheet()
+    for end in [None, '2024-01-05', '2024-02-15']:
+        assert actual.generate_cash_flow_statement(None, end) == expected.generate_cash_flow_statement(None, end)
+    pd.testing.assert_frame_equal(actual.generate_trial_balance(), expected.generate_trial_balance())
+
+
+def test_newest_first_statement_matches_oldest_first(statement):
+    # كشوف كثيرة تعرض الأحدث أولاً بما في ذلك حركات اليوم الواحد
+    newest_first = AccountingSystem(statement.iloc[::-1])
+
+    _assert_same_reports(newest_first, AccountingSystem(statement))
+    assert newest_first.generate_balance_sheet()[DIFFERENCE] == 0
+
+
+def test_newest_first_same_day_rows_keep_bank_balances():
+    df = make_statement([
+        ('2024-01-05', 'إيرادات مبيعات', 0, 500),
+        ('2024-01-05', 'مصاريف تشغيل', 120, 0),
+        ('2024-01-20', 'إيرادات أخرى', 0, 75),
+    ])
+    newest_first = AccountingSystem(df.iloc[::-1])
+    cash_flow = newest_first.generate_cash_flow_statement(None, '2024-01-05')
+
+    assert cash_flow['الرصيد النقدي في بداية الفترة'] == 1000
+    assert cash_flow['الرصيد النقدي في نهاية الفترة'] == 1380
+    assert newest_first.generate_balance_sheet()[DIFFERENCE] == 0
+
+
+def test_single_day_newest_first_uses_balance_chain():
+    df = make_statement([
+        ('2024-01-05', 'إيرادات مبيعات', 0, 500),
+        ('2024-01-05', 'مصاريف تشغيل', 120, 0),
+        ('2024-01-05', 'مصاريف بنكية', 15, 0),
+    ])
+
+    _assert_same_reports(AccountingSystem(df.iloc[::-1]), AccountingSystem(df))
+
+
+def test_unsorted_input_matches_sorted(statement):
+    # تواريخ فريدة حتى لا يعتمد الناتج على ترتيب حركات اليوم الواحد
+    unique_days = statement.drop_duplicates('[SA]Processing Date')
+    shuffled = unique_days.sample(frac=1, random_state=1)
+
+    _assert_same_reports(AccountingSystem(shuffled), AccountingSystem(unique_days))
+
+
+def test_empty_statement():
+    empty = make_statement([('2024-01-01', 'مصاريف تشغيل', 0, 0)]).iloc[:0]
+    accounting_system = AccountingSystem(empty)
+
+    assert accounting_system.generate_balance_sheet()[DIFFERENCE] == 0
+    assert accounting_system.generate_cash_flow_statement()['الرصيد النقدي في نهاية الفترة'] == 0
+    assert accounting_system.create_journal_entries().empty
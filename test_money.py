@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from money import parse_halalas, to_display_frame
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('1,250.75', 125075),
+    ('SAR 1,250.75', 125075),
+    ('-300', -30000),
+    ('0.1', 10),
+    ('.5', 50),
+    ('12.', 1200),
+    ('', 0),
+    ('abc', 0),
+    ('99999999999999.99', 9999999999999999),
+])
+def test_parse_text(text, expected):
+    assert parse_halalas(pd.Series([text])).tolist() == [expected]
+
+
+def test_parse_missing_values_are_zero():
+    assert parse_halalas(pd.Series(['1.00', None, np.nan], dtype=object)).tolist() == [100, 0, 0]
+    assert parse_halalas(pd.Series([1.0, np.nan, np.inf])).tolist() == [100, 0, 0]
+
+
+@pytest.mark.parametrize('value, expected', [
+    (0.125, 13),
+    (-0.125, -13),
+    (1.005, 101),
+    (2.675, 268),
+    (0.005, 1),
+    (0.0049, 0),
+    (19.999, 2000),
+    (33.333333, 3333),
+    (1e12 + 0.125, 100000000000013),
+])
+def test_numeric_and_text_round_the_same(value, expected):
+    numeric = parse_halalas(pd.Series([value]))
+    text = parse_halalas(pd.Series([repr(value)]))
+
+    assert numeric.dtype == np.int64
+    assert numeric.tolist() == text.tolist() == [expected]
+
+
+def test_display_frame_rounds_after_conversion():
+    df = pd.DataFrame({'الحساب': ['البنك', 'البنك'], 'المؤشر': ['المبلغ', 'التغير الشهري %'],
+                       '2024-01': [12345.678, 12.3456]})
+    display_df = to_display_frame(df)
+
+    assert display_df['2024-01'].tolist() == [123.46, 12.35]
+    assert to_display_frame(pd.DataFrame({'مدين': [12345]}))['مدين'].tolist() == [123.45]
@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+
+from pipeline_cache import PipelineCache
+
+
+class FakeResult:
+    """
+    نتيجة بسيطة قابلة للحفظ بحجم محدد بدلاً من PipelineResult.
+    """
+    def __init__(self, name, size_bytes=10):
+        self.name = name
+        self.size_bytes = size_bytes
+
+
+def _keys_on_disk(cache):
+    return [name for name in os.listdir(cache.spill_dir) if name.endswith('.pkl')]
+
+
+def test_build_once_then_hit(tmp_path):
+    cache = PipelineCache(100, spill_dir=str(tmp_path))
+    calls = []
+    builder = lambda: calls.append(1) or FakeResult('a')
+
+    first = cache.get_or_build('a', builder)
+    second = cache.get_or_build('a', builder)
+
+    assert first is second
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_eviction_spills_lru_and_reloads(tmp_path):
+    cache = PipelineCache(25, spill_dir=str(tmp_path))
+    for key in 'abc':
+        cache.get_or_build(key, lambda key=key: FakeResult(key))
+
+    metrics = cache.metrics()
+    assert metrics['عناصر في الذاكرة'] == 2
+    assert metrics['عناصر على القرص'] == 1
+    assert cache.evictions == 1
+    assert len(_keys_on_disk(cache)) == 1
+
+    reloaded = cache.get_or_build('a', lambda: FakeResult('rebuilt'))
+    assert reloaded.name == 'a'
+    assert cache.disk_loads == 1
+    # تحميل a أخرج b إلى القرص وحُذف ملف a
+    assert cache.metrics()['عناصر على القرص'] == 1
+    assert cache._spilled.keys() == {'b'}
+    assert len(_keys_on_disk(cache)) == 1
+
+
+def test_missing_spill_dir_is_created(tmp_path):
+    spill_dir = tmp_path / 'nested' / 'cache'
+    cache = PipelineCache(15, spill_dir=str(spill_dir))
+    cache.get_or_build('a', lambda: FakeResult('a'))
+    cache.get_or_build('b', lambda: FakeResult('b'))
+
+    assert spill_dir.is_dir()
+    assert cache.get_or_build('a', lambda: FakeResult('rebuilt')).name == 'a'
+
+
+def test_failed_spill_keeps_entry_in_memory(tmp_path):
+    cache = PipelineCache(15, spill_dir=str(tmp_path))
+    cache.get_or_build('a', lambda: FakeResult('a'))
+    os.rmdir(tmp_path)
+    cache.get_or_build('b', lambda: FakeResult('b'))
+
+    assert cache.spill_failures == 1
+    assert cache.evictions == 0
+    assert set(cache._entries) == {'a', 'b'}
+    assert cache.get_or_build('a', lambda: FakeResult('rebuilt')).name == 'a'
+
+
+def test_cleanup_removes_only_own_files(tmp_path):
+    other = tmp_path / 'other.pkl'
+    other.write_bytes(b'keep')
+    cache = PipelineCache(15, spill_dir=str(tmp_path))
+    cache.get_or_build('a', lambda: FakeResult('a'))
+    cache.get_or_build('b', lambda: FakeResult('b'))
+    assert len(_keys_on_disk(cache)) == 2
+
+    cache._finalizer()
+
+    assert [p.name for p in tmp_path.iterdir()] == ['other.pkl']
+
+
+def test_owned_temp_dir_is_removed():
+    cache = PipelineCache(15)
+    spill_dir = cache.spill_dir
+    cache.get_or_build('a', lambda: FakeResult('a'))
+    cache.get_or_build('b', lambda: FakeResult('b'))
+    del cache
+
+    assert not os.path.exists(spill_dir)
+
+
+def test_concurrent_access_builds_once_and_counts_once(tmp_path):
+    cache = PipelineCache(25, spill_dir=str(tmp_path))
+    builds = {key: 0 for key in 'abc'}
+    lock = threading.Lock()
+
+    def builder(key):
+        def build():
+            with lock:
+                builds[key] += 1
+            time.sleep(0.01)
+            return FakeResult(key)
+        return build
+
+    def worker(i):
+        key = 'abc'[i % 3]
+        assert cache.get_or_build(key, builder(key)).name == key
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(18)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert builds == {'a': 1, 'b': 1, 'c': 1}
+    assert cache.hits + cache.misses == 18
+    assert cache.misses == 3
+    # كل مفتاح إما في الذاكرة أو على القرص وليس في الاثنين
+    assert not set(cache._entries) & set(cache._spilled)
+    assert len(cache._entries) + len(cache._spilled) == 3
+    assert len(_keys_on_disk(cache)) == len(cache._spilled)
+    assert not cache._key_locks
@@ -1,14 +1,25 @@
+import numbers
 import streamlit as st
-import pandas as pd
-from io import BytesIO
-from fpdf import FPDF
+
+# مكتبات التصدير (pandas/openpyxl و fpdf) تُستورد عند أول تصدير فقط
+# حتى لا تبطئ ظهور شاشة رفع الملف
 
 def format_currency(value):
-    """تنسيق القيمة كعملة بالريال السعودي."""
-    return f"{value:,.2f} ريال"
+    """تنسيق قيمة بالهللات كعملة بالريال السعودي (التحويل إلى ريال يتم هنا عند العرض فقط)."""
+    from money import HALALAS_PER_RIYAL
+    
+    if isinstance(value, numbers.Integral):
+        # تحويل دقيق بدون أعداد عشرية
+        sign = '-' if value < 0 else ''
+        riyals, halalas = divmod(abs(int(value)), HALALAS_PER_RIYAL)
+        return f"{sign}{riyals:,}.{halalas:02d} ريال"
+    return f"{value / HALALAS_PER_RIYAL:,.2f} ريال"
 
 def to_excel(df):
     """تحويل DataFrame إلى ملف Excel في الذاكرة."""
+    import pandas as pd
+    from io import BytesIO
+    
     output = BytesIO()
     with pd.ExcelWriter(output, engine='openpyxl') as writer:
         df.to_excel(writer, index=False, sheet_name='Report')
@@ -17,6 +28,7 @@ def to_excel(df):
 
 def to_pdf(title, df=None, report_data=None):
     """تحويل البيانات إلى ملف PDF في الذاكرة."""
+    from fpdf import FPDF
     
     class PDF(FPDF):
         def header(self):
@@ -80,8 +92,12 @@ def to_pdf(title, df=None, report_data=None):
 
 def display_dataframe(title, df):
     """عرض جدول بيانات مع عنوان وأزرار تصدير."""
+    from money import to_display_frame
+    
     st.subheader(title)
     if not df.empty:
+        # تحويل المبالغ من هللات إلى ريال للعرض والتصدير فقط
+        df = to_display_frame(df)
         st.dataframe(df, use_container_width=True)
         
         # أزرار التصدير